@@ -1,43 +1,109 @@
 """
 Module: SQL Database Connection
 
-This module provides a function to create a SQLAlchemy database engine
-and import the 'text' class for executing raw SQL queries.
-
-Functions:
-    create_database_engine(url: str) -> sqlalchemy.engine.base.Engine
-        Creates and returns a SQLAlchemy database engine based on the provided URL.
-
-Imported Classes:
-    text
-        A class from the 'sqlalchemy' module that is used to define and execute
-        raw SQL queries within SQLAlchemy.
+This module provides the FlightData Data Access Layer built directly on
+Python's built-in 'sqlite3' driver. Queries are plain parameterized SQL
+strings; rows come back as 'sqlite3.Row' objects, which support
+dictionary-style access (row['COLUMN']) without any per-row wrapper
+construction.
 
 Example:
-    engine = create_database_engine("sqlite:///mydatabase.db")
-    query = text("SELECT * FROM users WHERE age > :age")
-    result = engine.execute(query, age=25)
-    for row in result:
-        print(row)
+    data_manager = FlightData("sqlite:///data/flights.sqlite3")
+    for row in data_manager.get_flight_by_id(2):
+        print(row['ORIGIN_AIRPORT'], row['DELAY'])
+
+When enriching flight rows with data from a related table (e.g. airport
+city names), do NOT issue one lookup per row — that is the classic N+1
+query pattern. Collect the keys from the whole result first and fetch
+the related rows in one query via FlightData._batch_fetch, then merge.
 """
-from sqlalchemy import create_engine, text
+import sqlite3
+from functools import lru_cache
+
+SQLITE_URI_PREFIX = 'sqlite:///'
 
-QUERY_FLIGHT_BY_ID = "SELECT flights.*, airlines.airline, flights.ID as FLIGHT_ID, \
-    flights.DEPARTURE_DELAY as DELAY FROM flights \
-        JOIN airlines ON flights.airline = airlines.id \
+# Each query projects only the columns print_results consumes; fetching
+# flights.* would decode and copy ~30 unused cells per row.
+QUERY_FLIGHT_BY_ID = "SELECT flights.ID, flights.ORIGIN_AIRPORT, \
+    flights.DESTINATION_AIRPORT, airlines.AIRLINE, flights.DEPARTURE_DELAY as DELAY \
+        FROM flights JOIN airlines ON flights.AIRLINE = airlines.ID \
             WHERE flights.ID = :id"
-QUERY_FLIGHT_BY_DATE = "SELECT flights.*, flights.ID as FLIGHT_ID, \
-    flights.ORIGIN_AIRPORT, flights.DESTINATION_AIRPORT, flights.DEPARTURE_DELAY as DELAY \
+QUERY_FLIGHT_BY_DATE = "SELECT flights.ID, flights.ORIGIN_AIRPORT, \
+    flights.DESTINATION_AIRPORT, flights.AIRLINE, flights.DEPARTURE_DELAY as DELAY \
         FROM flights WHERE flights.DAY = :day \
             AND flights.MONTH = :month AND flights.YEAR = :year"
-QUERY_FLIGHT_BY_AIRPORT = "SELECT flights.*, flights.ID as FLIGHT_ID, \
-    flights.ORIGIN_AIRPORT, flights.DESTINATION_AIRPORT, airlines.AIRLINE, flights.DEPARTURE_DELAY as DELAY \
+
+# The two "delayed flights" queries filter on the delay in SQL, so
+# on-time flights never cross the SQLite -> Python boundary at all.
+# DEPARTURE_DELAY is stored as '' (empty text) for some rows; the CAST
+# maps those to 0 so they count as not delayed, and matches the partial
+# indexes below. They also page through LIMIT/OFFSET so a popular
+# airport or airline cannot flood the caller; the chronological ORDER BY
+# (with ID as tie-breaker) keeps pages stable across calls.
+QUERY_FLIGHT_BY_AIRPORT = "SELECT flights.ID, flights.ORIGIN_AIRPORT, \
+    flights.DESTINATION_AIRPORT, airlines.AIRLINE, flights.DEPARTURE_DELAY as DELAY \
         FROM flights JOIN airlines ON flights.AIRLINE = airlines.ID \
-            WHERE flights.ORIGIN_AIRPORT = :origin_airport"
-QUERY_FLIGHT_BY_AIRLINE = "SELECT airlines.*, airlines.ID as AIRLINE_ID, \
-    flights.ORIGIN_AIRPORT, flights.DESTINATION_AIRPORT, airlines.AIRLINE, flights.DEPARTURE_DELAY as DELAY \
-        FROM flights JOIN airlines ON  airlines.ID = flights.AIRLINE \
-            WHERE airlines.AIRLINE = :airline"
+            WHERE flights.ORIGIN_AIRPORT = :origin_airport \
+                AND CAST(flights.DEPARTURE_DELAY AS INTEGER) > 0 \
+                    ORDER BY flights.MONTH, flights.DAY, flights.ID \
+                        LIMIT :limit OFFSET :offset"
+QUERY_FLIGHT_BY_AIRLINE = "SELECT flights.ID, flights.ORIGIN_AIRPORT, \
+    flights.DESTINATION_AIRPORT, airlines.AIRLINE, flights.DEPARTURE_DELAY as DELAY \
+        FROM flights JOIN airlines ON airlines.ID = flights.AIRLINE \
+            WHERE airlines.AIRLINE = :airline \
+                AND CAST(flights.DEPARTURE_DELAY AS INTEGER) > 0 \
+                    ORDER BY flights.MONTH, flights.DAY, flights.ID \
+                        LIMIT :limit OFFSET :offset"
+# Join-free variant used by get_delayed_flights_by_airline: the airline
+# ID comes from the _airline_ids dict loaded at startup, and the known
+# airline name is bound back in as a constant column so callers still
+# see AIRLINE on every row.
+QUERY_FLIGHT_BY_AIRLINE_ID = "SELECT flights.ID, flights.ORIGIN_AIRPORT, \
+    flights.DESTINATION_AIRPORT, :airline AS AIRLINE, flights.DEPARTURE_DELAY as DELAY \
+        FROM flights WHERE flights.AIRLINE = :airline_id \
+            AND CAST(flights.DEPARTURE_DELAY AS INTEGER) > 0 \
+                ORDER BY flights.MONTH, flights.DAY, flights.ID \
+                    LIMIT :limit OFFSET :offset"
+
+# Default page size for the paginated delayed-flights queries
+DEFAULT_PAGE_SIZE = 1000
+
+# Statement lookup for run_batch, so batch specs (e.g. parsed from JSON)
+# can name queries with plain strings.
+BATCH_QUERIES = {
+    'flight_by_id': QUERY_FLIGHT_BY_ID,
+    'flights_by_date': QUERY_FLIGHT_BY_DATE,
+    'delayed_flights_by_airport': QUERY_FLIGHT_BY_AIRPORT,
+    'delayed_flights_by_airline': QUERY_FLIGHT_BY_AIRLINE,
+}
+
+# Supporting indexes for the WHERE predicates used by the queries above.
+# Without them SQLite falls back to full scans of the flights table.
+CREATE_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_flights_ymd ON flights(YEAR, MONTH, DAY)",
+    "CREATE INDEX IF NOT EXISTS idx_flights_origin ON flights(ORIGIN_AIRPORT)",
+    "CREATE INDEX IF NOT EXISTS idx_flights_airline ON flights(AIRLINE)",
+    "CREATE INDEX IF NOT EXISTS idx_airlines_name ON airlines(AIRLINE)",
+    # Partial indexes covering only delayed flights; the WHERE clause
+    # matches the predicate in the delayed-flights queries exactly so the
+    # planner can use them.
+    "CREATE INDEX IF NOT EXISTS idx_flights_origin_delayed \
+        ON flights(ORIGIN_AIRPORT) WHERE CAST(DEPARTURE_DELAY AS INTEGER) > 0",
+    "CREATE INDEX IF NOT EXISTS idx_flights_airline_delayed \
+        ON flights(AIRLINE) WHERE CAST(DEPARTURE_DELAY AS INTEGER) > 0",
+)
+
+# Read-optimized PRAGMAs applied once on the shared connection:
+# WAL avoids writer blocking, mmap serves hot pages without read()
+# syscalls, and a 256 MiB page cache keeps the indexes in-process.
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA mmap_size=1073741824",
+    "PRAGMA cache_size=-262144",
+    "PRAGMA temp_store=MEMORY",
+)
+
 
 class FlightData:
     """
@@ -48,39 +114,138 @@ class FlightData:
     """
     def __init__(self, db_uri):
         """
-        Initialize a new engine using the given database URI
+        Initialize the shared sqlite3 connection using the given database
+        URI (or plain file path). One connection is kept open for the
+        object's lifetime, so its prepared-statement cache and SQLite page
+        cache stay warm across queries.
         """
-        self._engine = create_engine(db_uri)
+        db_path = db_uri.removeprefix(SQLITE_URI_PREFIX)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        for pragma in CONNECTION_PRAGMAS:
+            self._conn.execute(pragma)
+        self._create_indexes()
+        # The airlines table holds only a handful of rows; a name -> ID
+        # dict lets the airline query skip the join entirely.
+        self._airline_ids = {row['AIRLINE']: row['ID'] for row in
+                             self._conn.execute("SELECT ID, AIRLINE FROM airlines")}
+        # Let SQLite refresh whatever planner state it considers stale
+        self._conn.execute("PRAGMA optimize")
+
 
+    def _create_indexes(self):
+        """
+        Create the supporting indexes for the lookup queries (no-op when
+        they already exist) and make sure sqlite_stat1 planner statistics
+        exist, so the planner orders the flights/airlines join correctly.
+        ANALYZE scans every table, so it is skipped once stats are there;
+        PRAGMA optimize in __init__ keeps them fresh afterwards.
+        """
+        for statement in CREATE_INDEXES:
+            self._conn.execute(statement)
+        have_stats = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone()
+        if not (have_stats and
+                self._conn.execute("SELECT 1 FROM sqlite_stat1 LIMIT 1").fetchone()):
+            self._conn.execute("ANALYZE")
+        self._conn.commit()
 
     def _execute_query(self, query, params):
         """
         Execute an SQL query with the params provided in a dictionary,
-        and returns a list of records (dictionary-like objects).
-        If an exception was raised, print the error, and return an empty list.
+        and returns a list of records (dictionary-like sqlite3.Row objects).
+        Results are served from an in-process LRU cache when the same
+        query/params pair is repeated, so re-running a lookup skips
+        SQL parsing, planning and I/O entirely.
         """
-        records = []
-        with self._engine.connect() as conn:
-            # Use SQLAlchemy's text() object to bind parameters and execute the query
-            result = conn.execute(text(query), params)
-            for row in result:
-                records.append(row._asdict())
-            return records
+        return list(self._cached_query(query, tuple(sorted(params.items()))))
 
-    def get_delayed_flights_by_airline(self, origin_airport):
+    def _iter_query(self, query, params):
         """
-        Searches for flights using airline name.
-        If the flight was found, return a list with a single record
+        Execute a query and yield rows as dict-like sqlite3.Row objects,
+        so callers that stream (or stop early) never hold the full result
+        set in memory. Rows are pulled from the driver in batches of 1000
+        rather than one per call.
         """
-        params = {'airline': origin_airport}
-        return self._execute_query(QUERY_FLIGHT_BY_AIRLINE, params)
+        cursor = self._conn.execute(query, params)
+        while True:
+            chunk = cursor.fetchmany(1000)
+            if not chunk:
+                break
+            yield from chunk
 
-    def get_delayed_flights_by_airport(self, origin_airport):
+    @lru_cache(maxsize=256)
+    def _cached_query(self, query, param_items):
         """
-        Searches for flights using origin airport IATA code.
-        If the flight was found, return a list with a single record
+        Uncached query execution, memoized by (query, params) key.
+        Takes the params as a sorted tuple of items so the key is hashable,
+        and returns a tuple of records so cached entries stay immutable.
+        """
+        return tuple(self._iter_query(query, dict(param_items)))
+
+    def _batch_fetch(self, table, key_column, keys):
         """
-        params = {'origin_airport': origin_airport}
+        Fetch the rows of a related table for a whole batch of keys with
+        a single IN (...) query, returning a dict keyed by key_column.
+        Enrichment steps should collect their foreign keys from the full
+        flights result and call this once per related table, so any
+        relationship expansion costs two queries instead of one per row.
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+        placeholders = ", ".join("?" * len(keys))
+        query = f"SELECT * FROM {table} WHERE {key_column} IN ({placeholders})"
+        return {row[key_column]: row for row in self._conn.execute(query, keys)}
+
+    def run_batch(self, specs):
+        """
+        Run several queries over the shared connection and return a list
+        of result lists, one per spec. Each spec is a (query_key, params)
+        tuple, where query_key is one of the BATCH_QUERIES names. The
+        single connection keeps the SQLite page cache warm across the
+        whole batch.
+        """
+        results = []
+        for query_key, params in specs:
+            # Fill in paging defaults for the queries that take them
+            params = {'limit': DEFAULT_PAGE_SIZE, 'offset': 0, **params}
+            results.append(self._conn.execute(BATCH_QUERIES[query_key], params).fetchall())
+        return results
+
+    def invalidate(self):
+        """
+        Drop all cached query results. The database is read-only today,
+        so this only matters for future write paths.
+        """
+        self._cached_query.cache_clear()
+
+    def get_delayed_flights_by_airline(self, airline_name,
+                                       limit=DEFAULT_PAGE_SIZE, offset=0):
+        """
+        Searches for delayed flights using airline name, returning at
+        most `limit` records starting at `offset` (in chronological
+        order). The name is resolved to the airline's ID through the
+        dict loaded at startup, so the query probes flights directly
+        without joining airlines. Returns an empty list for unknown
+        airline names.
+        """
+        airline_id = self._airline_ids.get(airline_name)
+        if airline_id is None:
+            return []
+        params = {'airline': airline_name, 'airline_id': airline_id,
+                  'limit': limit, 'offset': offset}
+        return self._execute_query(QUERY_FLIGHT_BY_AIRLINE_ID, params)
+
+    def get_delayed_flights_by_airport(self, origin_airport,
+                                       limit=DEFAULT_PAGE_SIZE, offset=0):
+        """
+        Searches for delayed flights using origin airport IATA code,
+        returning at most `limit` records starting at `offset` (in
+        chronological order).
+        """
+        params = {'origin_airport': origin_airport,
+                  'limit': limit, 'offset': offset}
         return self._execute_query(QUERY_FLIGHT_BY_AIRPORT, params)
 
     def get_flight_by_id(self, flight_id):
@@ -99,9 +264,17 @@ class FlightData:
         params = {'day': day, 'month': month, 'year': year}
         return self._execute_query(QUERY_FLIGHT_BY_DATE, params)
 
-    def __del__(self):
+    def close(self):
         """
-        Closes the connection to the databse when the object is about to be destroyed
+        Close the connection to the database. Safe to call more than once,
+        e.g. both from a with-block exit and an atexit hook.
         """
-        self._engine.dispose()
-    
\ No newline at end of file
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
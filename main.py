@@ -1,62 +1,78 @@
 """
 Module: Data Processing and Storage
 
-This module handles data processing using the 'datetime' module and data storage
-with the help of the 'sqlalchemy' library. It also imports a module named 'data'
-that likely contains specific data-related functionalities.
+This module drives the interactive menu (and the --script batch mode)
+for the flight data CLI. Queries run through the 'data' module, which
+talks to the SQLite database via the built-in 'sqlite3' driver.
 
 Imported Modules:
     datetime
         Provides classes for working with dates and times, including creating,
         parsing, and formatting date and time objects.
 
-    sqlalchemy
-        A powerful SQL toolkit and Object-Relational Mapping (ORM) library for Python.
-        It facilitates database connection, query execution, and data manipulation.
-
     data
-        (Replace with a brief description of the 'data' module's purpose.)
-
-Functions:
-    process_data(date: datetime) -> processed_data
-        Processes the input date using functions from the 'data' module and returns
-        the processed data.
-
-Classes:
-    (Add descriptions of any classes defined in the 'data' module, if applicable.)
+        The Data Access Layer: the FlightData class and the SQL queries it runs.
 
 Example:
-    from datetime import datetime
-    from sqlalchemy import create_engine
     import data
 
-    input_date = datetime(2023, 8, 10)
-    processed_data = process_data(input_date)
-
-    engine = create_engine("sqlite:///mydatabase.db")
-    connection = engine.connect()
-    connection.execute(sqlalchemy.text("INSERT INTO processed_data 
-    VALUES (:data)"), data=processed_data)
-    connection.close()
+    data_manager = data.FlightData(SQLITE_URI)
+    results = data_manager.get_flights_by_date(1, 1, 2015)
+    print_results(results)
 """
+import atexit
+import json
+import re
+import sys
 from datetime import datetime
-import sqlalchemy
 import data
 
+# pandas/numpy are optional: with them installed, large result sets are
+# formatted vectorized instead of row-by-row in the interpreter.
+try:
+    import numpy as np
+    import pandas as pd
+except ImportError:
+    np = pd = None
+
 
 SQLITE_URI = 'sqlite:///data/flights.sqlite3'
 IATA_LENGTH = 3
+PRINT_BATCH_SIZE = 4096
+BULK_PRINT_THRESHOLD = 10000
+# Compiled once so batch validation of many codes is a single C-level
+# scan per code; bound to .match to skip the attribute lookup per call.
+IATA_MATCH = re.compile(r'^[A-Z]{%d}\Z' % IATA_LENGTH).match
+
+
+def paginate_results(fetch_page):
+    """
+    Fetch and print results one page at a time. fetch_page is called with
+    (limit, offset) and must return a list of records; after each full
+    page the user is asked whether to continue, so even the most popular
+    airline or airport prints a bounded amount per step.
+    """
+    offset = 0
+    while True:
+        results = fetch_page(data.DEFAULT_PAGE_SIZE, offset)
+        print_results(results)
+        if len(results) < data.DEFAULT_PAGE_SIZE:
+            break
+        if input("Show next page? [y/N] ").strip().lower() != 'y':
+            break
+        offset += data.DEFAULT_PAGE_SIZE
 
 
 def delayed_flights_by_airline(data_manager):
     """
     Asks the user for a textual airline name (any string will work here).
     Then runs the query using the data object method "get_delayed_flights_by_airline".
-    When results are back, calls "print_results" to show them to on the screen.
+    When results are back, calls "print_results" to show them to on the screen,
+    one page at a time.
     """
     airline_input = input("Enter airline name: ")
-    results = data_manager.get_delayed_flights_by_airline(airline_input)
-    print_results(results)
+    paginate_results(lambda limit, offset: data_manager
+                     .get_delayed_flights_by_airline(airline_input, limit, offset))
 
 
 def delayed_flights_by_airport(data_manager):
@@ -67,12 +83,14 @@ def delayed_flights_by_airport(data_manager):
     """
     valid = False
     while not valid:
-        airport_input = input("Enter origin airport IATA code: ")
+        # IATA codes are canonically uppercase, which is also how the
+        # database stores them
+        airport_input = input("Enter origin airport IATA code: ").upper()
         # Valide input
-        if airport_input.isalpha() and len(airport_input) == IATA_LENGTH:
+        if IATA_MATCH(airport_input):
             valid = True
-    results = data_manager.get_delayed_flights_by_airport(airport_input)
-    print_results(results)
+    paginate_results(lambda limit, offset: data_manager
+                     .get_delayed_flights_by_airport(airport_input, limit, offset))
 
 
 def flight_by_id(data_manager):
@@ -112,14 +130,45 @@ def flights_by_date(data_manager):
     print_results(results)
 
 
+def print_results_bulk(results):
+    """
+    Vectorized version of print_results for large result sets.
+    Builds a DataFrame from the rows and formats every line at once with
+    numpy.where instead of branching per row in the interpreter.
+    """
+    print(f"Got {len(results)} results.")
+    frame = pd.DataFrame([tuple(row) for row in results],
+                         columns=results[0].keys())
+    # DELAY may hold NULLs or empty strings; both mean "no delay"
+    delay = pd.to_numeric(frame['DELAY'], errors='coerce').fillna(0).astype('int32')
+    base = (frame['ID'].astype(str) + '. ' + frame['ORIGIN_AIRPORT']
+            + ' -> ' + frame['DESTINATION_AIRPORT']
+            + ' by ' + frame['AIRLINE'].astype(str))
+    lines = np.where(delay > 0,
+                     base + ', Delay: ' + delay.astype(str) + ' Minutes',
+                     base)
+    sys.stdout.write("\n".join(lines.tolist()) + "\n")
+    sys.stdout.flush()
+
+
 def print_results(results):
     """
-    Get a list of flight results (List of dictionary-like objects from SQLAachemy).
+    Get a list of flight results (List of dictionary-like sqlite3.Row objects).
     Even if there is one result, it should be provided in a list.
     Each object *has* to contain the columns:
     FLIGHT_ID, ORIGIN_AIRPORT, DESTINATION_AIRPORT, AIRLINE, and DELAY.
     """
+    # Hand very large result sets to the vectorized formatter when
+    # pandas is available
+    if pd is not None and len(results) >= BULK_PRINT_THRESHOLD:
+        print_results_bulk(results)
+        return
+
     print(f"Got {len(results)} results.")
+    # Buffer formatted lines and write them in large chunks: one write
+    # per PRINT_BATCH_SIZE rows instead of one print call (lock + flush)
+    # per row, which dominates wall-time on big airline listings.
+    lines = []
     for result in results:
         # Check that all required columns are in place
         try:
@@ -128,15 +177,21 @@ def print_results(results):
             origin = result['ORIGIN_AIRPORT']
             dest = result['DESTINATION_AIRPORT']
             airline = result['AIRLINE']
-        except (ValueError, sqlalchemy.exc.SQLAlchemyError) as error:
+        except (ValueError, IndexError) as error:
             print("Error showing results: ", error)
             return
 
-        # Different prints for delayed and non-delayed flights
+        # Different lines for delayed and non-delayed flights
         if delay and delay > 0:
-            print(f"{result['ID']}. {origin} -> {dest} by {airline}, Delay: {delay} Minutes")
+            lines.append(f"{result['ID']}. {origin} -> {dest} by {airline}, Delay: {delay} Minutes")
         else:
-            print(f"{result['ID']}. {origin} -> {dest} by {airline}")
+            lines.append(f"{result['ID']}. {origin} -> {dest} by {airline}")
+        if len(lines) >= PRINT_BATCH_SIZE:
+            sys.stdout.write("\n".join(lines) + "\n")
+            lines.clear()
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
 
 
 def show_menu_and_get_input():
@@ -145,44 +200,87 @@ def show_menu_and_get_input():
     If it's a valid option, return a pointer to the function to execute.
     Otherwise, keep asking the user for input.
     """
-    print("Menu:")
-    for key, value in FUNCTIONS.items():
-        print(f"{key}. {value[1]}")
+    print_menu()
 
     # Input loop
     while True:
         try:
             choice = int(input())
-            if choice in FUNCTIONS:
-                return FUNCTIONS[choice][0]
+            if 1 <= choice <= len(FUNCTIONS):
+                return FUNCTIONS[choice - 1][0]
         except ValueError:
             pass
         print("Try again...")
 
 
-# Function Dispatch Dictionary
-FUNCTIONS = { 1: (flight_by_id, "Show flight by ID"),
-              2: (flights_by_date, "Show flights by date"),
-              3: (delayed_flights_by_airline, "Delayed flights by airline"),
-              4: (delayed_flights_by_airport, "Delayed flights by origin airport"),
-              5: (quit, "Exit")
-             }
+# Function Dispatch Tuple, indexed by menu choice - 1
+FUNCTIONS = ((flight_by_id, "Show flight by ID"),
+             (flights_by_date, "Show flights by date"),
+             (delayed_flights_by_airline, "Delayed flights by airline"),
+             (delayed_flights_by_airport, "Delayed flights by origin airport"),
+             (quit, "Exit")
+            )
+
+# The menu text never changes, so render it once at import; the encoded
+# form goes straight to the byte stream, skipping per-iteration Unicode
+# encoding in the menu loop
+MENU_STR = "Menu:\n" + "\n".join(f"{index + 1}. {label}"
+                                 for index, (_, label) in enumerate(FUNCTIONS))
+MENU_BYTES = (MENU_STR + "\n").encode()
+
+
+def print_menu():
+    """
+    Write the pre-encoded menu in a single call to the underlying byte
+    stream, falling back to print() when stdout has no buffer (e.g. when
+    it has been replaced by a StringIO in tests).
+    """
+    buffer = getattr(sys.stdout, 'buffer', None)
+    if buffer is not None:
+        sys.stdout.flush()  # keep ordering with earlier text-level writes
+        buffer.write(MENU_BYTES)
+        buffer.flush()
+    else:
+        print(MENU_STR)
+
+
+def run_script(data_manager, script_path):
+    """
+    Run a batch of queries from a JSON file and print each result set.
+    The file holds a list of [query_key, params] pairs, where query_key
+    names one of the queries in data.BATCH_QUERIES, e.g.:
+    [["flight_by_id", {"id": 2}], ["flights_by_date", {"day": 1, "month": 1, "year": 2015}]]
+    All queries run over a single connection via FlightData.run_batch.
+    """
+    with open(script_path, encoding='utf-8') as script_file:
+        specs = json.load(script_file)
+    for results in data_manager.run_batch(specs):
+        print_results(results)
 
 
 def main():
     """
     Main function for flight data management.
-    
-    Creates a FlightData instance, enters a menu loop
+
+    Creates a FlightData instance, then either runs a JSON batch script
+    (when called with --script file.json) or enters a menu loop
     to execute data management functions based on user input.
     """
-    # Create an instance of the Data Object using our SQLite URI
-    data_manager = data.FlightData(SQLITE_URI)
+    # Create an instance of the Data Object using our SQLite URI.
+    # The with-block closes the connection deterministically on the way
+    # out; the atexit hook covers exits that bypass it (e.g. Ctrl-C).
+    with data.FlightData(SQLITE_URI) as data_manager:
+        atexit.register(data_manager.close)
+
+        # Scriptable batch mode: python main.py --script queries.json
+        if len(sys.argv) == 3 and sys.argv[1] == '--script':
+            run_script(data_manager, sys.argv[2])
+            return
 
-    # The Main Menu loop
-    while True:
-        choice_func = show_menu_and_get_input()
-        choice_func(data_manager)
+        # The Main Menu loop
+        while True:
+            choice_func = show_menu_and_get_input()
+            choice_func(data_manager)
 
 
 if __name__ == "__main__":